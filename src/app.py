@@ -84,12 +84,12 @@ def root():
 
 
 @app.get("/activities")
-def get_activities():
+def get_activities() -> dict[str, dict]:
     return activities
 
 
 @app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
+def signup_for_activity(activity_name: str, email: str) -> dict[str, str]:
     """Sign up a student for an activity"""
     # Validate activity exists
     if activity_name not in activities:
@@ -107,7 +107,7 @@ def signup_for_activity(activity_name: str, email: str):
 
 
 @app.delete("/activities/{activity_name}/unregister")
-def unregister_from_activity(activity_name: str, email: str):
+def unregister_from_activity(activity_name: str, email: str) -> dict[str, str]:
     """Unregister a student from an activity"""
     # Validate activity exists
     if activity_name not in activities:
@@ -2,112 +2,148 @@
 Tests for the Mergington High School API endpoints
 """
 
-import pytest
-from fastapi.testclient import TestClient
-from src.app import app, activities
+import asyncio
 
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+from src.app import (
+    app,
+    activities,
+    signup_for_activity,
+    unregister_from_activity,
+)
 
-@pytest.fixture
-def client():
-    """Create a test client"""
-    return TestClient(app)
+# HTTP tests run on the session event loop shared with the client fixture
+_ASYNC_HTTP = pytest.mark.asyncio(loop_scope="session")
 
+# Endpoint URL builders for the activity signup and unregister routes
+_SIGNUP_URL = "/activities/{}/signup".format
+_UNREG_URL = "/activities/{}/unregister".format
 
-@pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities to initial state before each test"""
-    # Store original state
-    original_activities = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Basketball Team": {
-            "description": "Competitive basketball training and interschool games",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 6:00 PM",
-            "max_participants": 15,
-            "participants": []
-        },
-        "Swimming Club": {
-            "description": "Swimming lessons and competitive swimming events",
-            "schedule": "Mondays and Wednesdays, 3:00 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": []
-        },
-        "Art Studio": {
-            "description": "Explore painting, drawing, and mixed media art projects",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 15,
-            "participants": []
-        },
-        "Drama Club": {
-            "description": "Acting, theater production, and performance skills",
-            "schedule": "Thursdays, 4:00 PM - 6:00 PM",
-            "max_participants": 25,
-            "participants": []
-        },
-        "Debate Team": {
-            "description": "Develop critical thinking and public speaking through competitive debates",
-            "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 16,
-            "participants": []
-        },
-        "Science Olympiad": {
-            "description": "Prepare for science competitions and conduct experiments",
-            "schedule": "Fridays, 3:00 PM - 5:00 PM",
-            "max_participants": 18,
-            "participants": []
-        }
+# Initial state of the in-memory activity database
+_ORIGINAL_ACTIVITIES = {
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12,
+        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30,
+        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+    },
+    "Basketball Team": {
+        "description": "Competitive basketball training and interschool games",
+        "schedule": "Tuesdays and Thursdays, 4:00 PM - 6:00 PM",
+        "max_participants": 15,
+        "participants": []
+    },
+    "Swimming Club": {
+        "description": "Swimming lessons and competitive swimming events",
+        "schedule": "Mondays and Wednesdays, 3:00 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": []
+    },
+    "Art Studio": {
+        "description": "Explore painting, drawing, and mixed media art projects",
+        "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
+        "max_participants": 15,
+        "participants": []
+    },
+    "Drama Club": {
+        "description": "Acting, theater production, and performance skills",
+        "schedule": "Thursdays, 4:00 PM - 6:00 PM",
+        "max_participants": 25,
+        "participants": []
+    },
+    "Debate Team": {
+        "description": "Develop critical thinking and public speaking through competitive debates",
+        "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
+        "max_participants": 16,
+        "participants": []
+    },
+    "Science Olympiad": {
+        "description": "Prepare for science competitions and conduct experiments",
+        "schedule": "Fridays, 3:00 PM - 5:00 PM",
+        "max_participants": 18,
+        "participants": []
     }
-    
-    # Reset activities
+}
+
+# Names of the initial activities, in API order
+ACTIVITY_NAMES = tuple(_ORIGINAL_ACTIVITIES)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """Create an ASGI test client shared across the test session"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+        transport=transport, base_url="http://test", follow_redirects=False
+    ) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def participant_snapshot():
+    """Load the initial activities once and snapshot their participants"""
     activities.clear()
-    activities.update(original_activities)
-    
+    for name, spec in _ORIGINAL_ACTIVITIES.items():
+        activities[name] = {**spec, "participants": list(spec["participants"])}
+
+    return {name: list(spec["participants"]) for name, spec in activities.items()}
+
+
+@pytest.fixture
+def reset_activities(participant_snapshot):
+    """Restore participants to their initial state after each test"""
     yield
 
+    # Only the participants lists are mutated by the API, so restore them
+    # in place rather than rebuilding the activities
+    for name, participants in participant_snapshot.items():
+        activities[name]["participants"][:] = participants
+
 
+@_ASYNC_HTTP
 class TestRootEndpoint:
     """Tests for the root endpoint"""
     
-    def test_root_redirects_to_index(self, client):
+    async def test_root_redirects_to_index(self, client):
         """Test that root redirects to static index.html"""
-        response = client.get("/", follow_redirects=False)
-        assert response.status_code == 307
-        assert response.headers["location"] == "/static/index.html"
+        # Only the status and headers are checked, so leave the body unread
+        async with client.stream("GET", "/") as response:
+            assert response.status_code == 307
+            assert response.headers["location"] == "/static/index.html"
 
 
+@_ASYNC_HTTP
+@pytest.mark.usefixtures("participant_snapshot")
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
     
-    def test_get_activities_success(self, client):
+    async def test_get_activities_success(self, client):
         """Test getting all activities"""
-        response = client.get("/activities")
+        response = await client.get("/activities")
         assert response.status_code == 200
         
         data = response.json()
         assert len(data) == 9
-        assert "Chess Club" in data
-        assert "Programming Class" in data
-        assert "Basketball Team" in data
+        assert tuple(data) == ACTIVITY_NAMES
         
-    def test_get_activities_structure(self, client):
+    async def test_get_activities_structure(self, client):
         """Test that activities have the correct structure"""
-        response = client.get("/activities")
+        response = await client.get("/activities")
         data = response.json()
         
         chess_club = data["Chess Club"]
@@ -120,175 +156,136 @@ class TestGetActivities:
         assert len(chess_club["participants"]) == 2
 
 
+@pytest.mark.usefixtures("reset_activities")
 class TestSignupForActivity:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
     
-    def test_signup_success(self, client):
-        """Test successful signup for an activity"""
-        response = client.post(
-            "/activities/Basketball Team/signup",
-            params={"email": "test@mergington.edu"}
-        )
-        assert response.status_code == 200
+    @pytest.mark.parametrize("activity", ACTIVITY_NAMES)
+    def test_signup_success(self, activity):
+        """Test successful signup for each activity"""
+        result = signup_for_activity(activity, "test@mergington.edu")
+        assert result == {"message": f"Signed up test@mergington.edu for {activity}"}
         
-        data = response.json()
-        assert data["message"] == "Signed up test@mergington.edu for Basketball Team"
-        
-        # Verify participant was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "test@mergington.edu" in activities_data["Basketball Team"]["participants"]
-    
-    def test_signup_duplicate(self, client):
-        """Test that duplicate signup is rejected"""
-        # First signup
-        client.post(
-            "/activities/Basketball Team/signup",
-            params={"email": "test@mergington.edu"}
-        )
-        
-        # Second signup with same email
-        response = client.post(
-            "/activities/Basketball Team/signup",
-            params={"email": "test@mergington.edu"}
-        )
-        assert response.status_code == 400
-        assert response.json()["detail"] == "Student already signed up for this activity"
+        # Verify participant was appended to any existing participants
+        participants = activities[activity]["participants"]
+        assert participants[-1] == "test@mergington.edu"
+        assert len(participants) == len(_ORIGINAL_ACTIVITIES[activity]["participants"]) + 1
     
-    def test_signup_nonexistent_activity(self, client):
-        """Test signup for non-existent activity"""
-        response = client.post(
-            "/activities/Nonexistent Club/signup",
-            params={"email": "test@mergington.edu"}
-        )
-        assert response.status_code == 404
-        assert response.json()["detail"] == "Activity not found"
-    
-    def test_signup_with_existing_participants(self, client):
-        """Test signup for activity that already has participants"""
-        response = client.post(
-            "/activities/Chess Club/signup",
-            params={"email": "new.student@mergington.edu"}
-        )
-        assert response.status_code == 200
-        
-        # Verify participant was added to existing list
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        participants = activities_data["Chess Club"]["participants"]
-        
-        assert "new.student@mergington.edu" in participants
-        assert len(participants) == 3  # 2 original + 1 new
-    
-    def test_signup_url_encoding(self, client):
+    @_ASYNC_HTTP
+    async def test_signup_url_encoding(self, client):
         """Test signup with activity name that requires URL encoding"""
-        response = client.post(
-            "/activities/Programming Class/signup",
+        response = await client.post(
+            _SIGNUP_URL("Programming Class"),
             params={"email": "coder@mergington.edu"}
         )
         assert response.status_code == 200
+        assert response.json()["message"] == "Signed up coder@mergington.edu for Programming Class"
+        
+        # Verify the decoded activity name was used
+        assert "coder@mergington.edu" in activities["Programming Class"]["participants"]
 
 
+@pytest.mark.usefixtures("reset_activities")
 class TestUnregisterFromActivity:
     """Tests for DELETE /activities/{activity_name}/unregister endpoint"""
     
-    def test_unregister_success(self, client):
+    def test_unregister_success(self):
         """Test successful unregistration from an activity"""
         # First, ensure participant is registered
         email = "michael@mergington.edu"
         
         # Unregister
-        response = client.delete(
-            "/activities/Chess Club/unregister",
-            params={"email": email}
-        )
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["message"] == f"Unregistered {email} from Chess Club"
+        result = unregister_from_activity("Chess Club", email)
+        assert result == {"message": f"Unregistered {email} from Chess Club"}
         
         # Verify participant was removed
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert email not in activities_data["Chess Club"]["participants"]
-    
-    def test_unregister_not_registered(self, client):
-        """Test unregistration when participant is not registered"""
-        response = client.delete(
-            "/activities/Basketball Team/unregister",
-            params={"email": "notregistered@mergington.edu"}
-        )
-        assert response.status_code == 400
-        assert response.json()["detail"] == "Student is not registered for this activity"
-    
-    def test_unregister_nonexistent_activity(self, client):
-        """Test unregistration from non-existent activity"""
-        response = client.delete(
-            "/activities/Nonexistent Club/unregister",
-            params={"email": "test@mergington.edu"}
-        )
-        assert response.status_code == 404
-        assert response.json()["detail"] == "Activity not found"
+        assert email not in activities["Chess Club"]["participants"]
     
-    def test_unregister_all_participants(self, client):
+    def test_unregister_all_participants(self):
         """Test unregistering all participants from an activity"""
         # Unregister both participants from Chess Club
-        client.delete("/activities/Chess Club/unregister", params={"email": "michael@mergington.edu"})
-        client.delete("/activities/Chess Club/unregister", params={"email": "daniel@mergington.edu"})
+        unregister_from_activity("Chess Club", "michael@mergington.edu")
+        unregister_from_activity("Chess Club", "daniel@mergington.edu")
         
         # Verify activity has no participants
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert len(activities_data["Chess Club"]["participants"]) == 0
+        assert len(activities["Chess Club"]["participants"]) == 0
 
 
+@pytest.mark.usefixtures("participant_snapshot")
+class TestErrorResponses:
+    """Tests for error responses from the signup and unregister endpoints"""
+
+    @pytest.mark.parametrize(
+        "handler, activity, email, expected_status, expected_detail",
+        [
+            (signup_for_activity, "Chess Club", "michael@mergington.edu",
+             400, "Student already signed up for this activity"),
+            (signup_for_activity, "Nonexistent Club", "test@mergington.edu",
+             404, "Activity not found"),
+            (unregister_from_activity, "Basketball Team", "notregistered@mergington.edu",
+             400, "Student is not registered for this activity"),
+            (unregister_from_activity, "Nonexistent Club", "test@mergington.edu",
+             404, "Activity not found"),
+        ],
+        ids=[
+            "signup_duplicate",
+            "signup_nonexistent_activity",
+            "unregister_not_registered",
+            "unregister_nonexistent_activity",
+        ],
+    )
+    def test_error_responses(self, handler, activity, email, expected_status, expected_detail):
+        """Test that invalid signup and unregister requests are rejected"""
+        with pytest.raises(HTTPException) as exc_info:
+            handler(activity, email)
+        assert exc_info.value.status_code == expected_status
+        assert exc_info.value.detail == expected_detail
+
+
+@_ASYNC_HTTP
+@pytest.mark.usefixtures("reset_activities")
 class TestIntegrationScenarios:
     """Integration tests for complete user workflows"""
     
-    def test_signup_and_unregister_workflow(self, client):
+    async def test_signup_and_unregister_workflow(self, client):
         """Test complete signup and unregister workflow"""
         email = "workflow.test@mergington.edu"
         activity = "Swimming Club"
         
         # Sign up
-        signup_response = client.post(
-            f"/activities/{activity}/signup",
+        signup_response = await client.post(
+            _SIGNUP_URL(activity),
             params={"email": email}
         )
         assert signup_response.status_code == 200
         
         # Verify signup
-        activities_response = client.get("/activities")
-        assert email in activities_response.json()[activity]["participants"]
+        assert email in activities[activity]["participants"]
         
         # Unregister
-        unregister_response = client.delete(
-            f"/activities/{activity}/unregister",
+        unregister_response = await client.delete(
+            _UNREG_URL(activity),
             params={"email": email}
         )
         assert unregister_response.status_code == 200
         
         # Verify unregistration
-        activities_response = client.get("/activities")
-        assert email not in activities_response.json()[activity]["participants"]
+        assert email not in activities[activity]["participants"]
     
-    def test_multiple_signups_different_activities(self, client):
+    async def test_multiple_signups_different_activities(self, client):
         """Test signing up for multiple activities"""
         email = "multisport@mergington.edu"
         
         # Sign up for multiple activities
         activities_to_join = ["Basketball Team", "Swimming Club", "Drama Club"]
         
-        for activity in activities_to_join:
-            response = client.post(
-                f"/activities/{activity}/signup",
-                params={"email": email}
-            )
+        responses = await asyncio.gather(*[
+            client.post(_SIGNUP_URL(activity), params={"email": email})
+            for activity in activities_to_join
+        ])
+        for response in responses:
             assert response.status_code == 200
         
         # Verify all signups
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        
         for activity in activities_to_join:
-            assert email in activities_data[activity]["participants"]
+            assert email in activities[activity]["participants"]